@@ -1,12 +1,23 @@
 import os
+import time
+import socket
 import asyncio
+import heapq
 import math
-import json
-from typing import Optional, List, Dict
+import operator
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Optional, List, Dict, Tuple
 
 import aiohttp
+import msgspec
+import orjson
+try:
+    import uvloop
+except ImportError:  # uvloop doesn't support Windows; fall back to the default event loop
+    uvloop = None
 from telegram import Update
-from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
+from telegram.ext import Application, ApplicationBuilder, CommandHandler, ContextTypes
 
 # Configuration
 # This is a good way to handle environment variables for security.
@@ -14,113 +25,295 @@ TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 BINANCE_REST_BASE = "https://api.binance.com"
 BINANCE_P2P_SEARCH = "https://p2p.binance.com/bapi/c2c/v2/friendly/c2c/adv/search"
 COINGECKO_API = "https://api.coingecko.com/api/v3"
+BINANCE_TICKER_ALL_URL = BINANCE_REST_BASE + "/api/v3/ticker/price"
+# How long (seconds) a Binance ticker price is reused before it's fetched again.
+PRICE_CACHE_TTL = 3.0
+# CoinGecko's free tier is heavily rate-limited, so coin info and symbol->id lookups are cached longer.
+COIN_INFO_CACHE_TTL = 90.0
+COIN_ID_CACHE_TTL = 6 * 3600.0
+# Per-request timeouts (seconds) for all outbound HTTP calls.
+HTTP_TIMEOUT = 10.0
+HTTP_CONNECT_TIMEOUT = 5.0
+# Max entries kept per cache; least recently used entries are evicted first.
+CACHE_MAXSIZE = 1024
+# Only ask /coins/<id> for the sections coingecko_coin_info_by_symbol actually reads.
+COINGECKO_COIN_QUERY = "localization=false&tickers=false&market_data=true&community_data=false&developer_data=false&sparkline=false"
 
 # --- Utility HTTP helpers ---
 
+# One long-lived session shared by every handler (stored in application.bot_data), so keep-alive
+# connections (and TLS sessions) to Binance and CoinGecko are reused between requests.
+def new_session() -> aiohttp.ClientSession:
+    """Create the pooled HTTP session shared by all handlers."""
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=20,
+        keepalive_timeout=75,
+        # aiodns-based resolver (from aiohttp[speedups]) instead of the threaded getaddrinfo one
+        resolver=aiohttp.AsyncResolver(),
+        use_dns_cache=True,
+        ttl_dns_cache=600,
+        family=socket.AF_INET,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"Accept-Encoding": "br, gzip, deflate"},
+        # Short timeout so a stalled upstream can't hold a semaphore slot (and queue every caller) for long.
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT, sock_connect=HTTP_CONNECT_TIMEOUT),
+    )
+
+async def open_session(app: Application) -> None:
+    """Post-init hook: create the shared HTTP session in app.bot_data."""
+    app.bot_data["http_session"] = new_session()
+
+async def close_session(app: Application) -> None:
+    """Post-shutdown hook: close the shared HTTP session."""
+    session = app.bot_data.pop("http_session", None)
+    if session is not None:
+        await session.close()
+
+# Caps on in-flight requests per upstream, so bursts of commands don't trip Binance/CoinGecko rate limits.
+_BINANCE_SEM = asyncio.Semaphore(10)
+_P2P_SEM = asyncio.Semaphore(5)
+_COINGECKO_SEM = asyncio.Semaphore(3)
+
 async def fetch_json(session: aiohttp.ClientSession, method: str, url: str, **kwargs):
     """
     A helper function to fetch and parse JSON from a URL.
     It includes basic error handling for parsing JSON.
     """
     async with session.request(method, url, **kwargs) as resp:
-        text = await resp.text()
+        raw = await resp.read()
         try:
-            return json.loads(text)
-        except Exception:
-            # Return raw text if JSON parsing fails to help with debugging.
-            return {"_raw": text}
+            # orjson parses the body bytes directly, whatever the content type says (no bytes -> str copy).
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Return raw text if the body is empty or not JSON, to help with debugging.
+            return {"_raw": await resp.text()}
+
+class UpstreamError(Exception):
+    """An upstream answered with an error or an unexpected body (e.g. a rate-limit response)."""
+
+def lru_put(cache: "OrderedDict[str, Any]", key: str, value: Any, maxsize: int = CACHE_MAXSIZE) -> None:
+    """Store value as the most recently used entry, evicting the oldest ones beyond maxsize."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+
+async def cached_fetch(cache: "OrderedDict[str, Tuple[Any, float]]", inflight: Dict[str, asyncio.Task], key: str,
+                       ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return cache[key] while it's fresh, otherwise await fetch() and store the result for ttl seconds.
+    The cache is an LRU capped at CACHE_MAXSIZE entries (keys can come straight from user input).
+    Concurrent callers for the same key share one in-flight task, so only one of them hits the network
+    and all of them get its result — or its exception, in which case nothing is cached.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        if time.monotonic() < entry[1]:
+            cache.move_to_end(key)
+            return entry[0]
+        del cache[key]
+    task = inflight.get(key)
+    if task is None:
+        async def fill() -> Any:
+            value = await fetch()
+            lru_put(cache, key, (value, time.monotonic() + ttl))
+            return value
+
+        def done(t: asyncio.Task) -> None:
+            if inflight.get(key) is t:
+                del inflight[key]
+            if not t.cancelled():
+                t.exception()  # mark as retrieved in case every waiter was cancelled
+
+        task = inflight[key] = asyncio.ensure_future(fill())
+        task.add_done_callback(done)
+    # shield: one caller being cancelled mustn't cancel the fetch the others are waiting on
+    return await asyncio.shield(task)
 
 # --- P2P functions ---
 
-async def fetch_p2p_offers(asset: str = "USDT", fiat: str = "ETB", trade_type: str = "BUY", amount: Optional[str] = None, rows: int = 20) -> List[Dict]:
+# The P2P search request/response shapes are fixed, so they're declared as msgspec structs:
+# the payload is encoded and the response decoded in one C-level pass, without nested dict walks.
+# Only the fields the handlers format are declared; anything else in the response is ignored.
+
+class P2PSearchRequest(msgspec.Struct, omit_defaults=True):
+    asset: str
+    fiat: str
+    tradeType: str
+    rows: int
+    page: int
+    proMerchantAds: bool
+    publisherType: Optional[str]
+    transAmount: Optional[str] = None  # left out of the payload when not set
+
+class P2PAdv(msgspec.Struct):
+    price: Optional[str] = None
+    minSingleTransAmount: Optional[str] = None
+    maxSingleTransAmount: Optional[str] = None
+    fiat: Optional[str] = None
+
+class P2PAdvertiser(msgspec.Struct):
+    nickName: Optional[str] = None
+    userName: Optional[str] = None
+    monthOrderCount: Optional[int] = None
+
+    @property
+    def display_name(self) -> Optional[str]:
+        return self.nickName or self.userName
+
+class P2PItem(msgspec.Struct):
+    adv: P2PAdv = msgspec.field(default_factory=P2PAdv)
+    advertiser: P2PAdvertiser = msgspec.field(default_factory=P2PAdvertiser)
+    # Not part of the response: set after decoding so callers can rank offers without re-parsing the price string.
+    price_f: float = 0.0
+
+    def __post_init__(self):
+        self.price_f = float(self.adv.price or 0.0)
+
+class P2PSearchResponse(msgspec.Struct):
+    data: Optional[List[P2PItem]] = None
+
+_P2P_ENCODER = msgspec.json.Encoder()
+# strict=False accepts e.g. "5" or 5.0 for monthOrderCount instead of rejecting the whole page.
+_P2P_DECODER = msgspec.json.Decoder(P2PSearchResponse, strict=False)
+
+# Static parts of the P2P search request; per-call fields are merged in by fetch_p2p_offers.
+_P2P_PAYLOAD_BASE = MappingProxyType({
+    "page": 1,
+    "proMerchantAds": False,
+    "publisherType": None,
+})
+_P2P_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+
+async def fetch_p2p_offers(session: aiohttp.ClientSession, asset: str = "USDT", fiat: str = "ETB", trade_type: str = "BUY", amount: Optional[str] = None, rows: int = 20) -> List[P2PItem]:
     """
     Fetch P2P offers using Binance's public P2P endpoint.
     trade_type: "BUY" or "SELL" as expected by the endpoint ("BUY" means buy crypto on P2P page).
-    amount: string amount for transAmount (e.g. "5000" meaning 5000 ETB or 50 for USDT depending on request)
-    Returns list of adv objects (raw) — caller will format.
+    amount: string amount for transAmount (e.g. "5000" meaning 5000 ETB)
+    Returns the decoded P2PItem structs (adv + advertiser) — caller will format.
     """
-    payload = {
-        "page": 1,
-        "rows": rows,
-        "asset": asset,
-        "fiat": fiat,
-        "tradeType": trade_type,
-        "proMerchantAds": False,
-        "publisherType": None,
-    }
-    if amount is not None:
-        payload["transAmount"] = str(amount)
-
-    headers = {"Content-Type": "application/json"}
-    async with aiohttp.ClientSession() as session:
-        data = await fetch_json(session, "POST", BINANCE_P2P_SEARCH, json=payload, headers=headers)
-
-    # The response format contains data list with adv, advertiser etc.
-    items = []
-    for d in data.get("data", []):
-        adv = d.get("adv", {})
-        advertiser = d.get("advertiser", {})
-        item = {
-            "price": adv.get("price"),
-            "minSingleTransAmount": adv.get("minSingleTransAmount"),
-            "maxSingleTransAmount": adv.get("maxSingleTransAmount"),
-            "fiat": adv.get("fiat"),
-            "asset": adv.get("asset"),
-            "tradeType": adv.get("tradeType"),
-            "publisherType": d.get("advertiser","{}").get("userType"),
-            "nickName": advertiser.get("nickName") or advertiser.get("userName"),
-            "monthOrderCount": advertiser.get("monthOrderCount"),
-            "orderCompleteRate": advertiser.get("orderCompleteRate"),
-            "tradeMethods": d.get("adv", {}).get("tradeMethods", []),
-            "adv": adv,
-        }
-        items.append(item)
+    payload = P2PSearchRequest(
+        **_P2P_PAYLOAD_BASE, rows=rows, asset=asset, fiat=fiat, tradeType=trade_type,
+        transAmount=None if amount is None else str(amount),
+    )
+
+    try:
+        async with _P2P_SEM:
+            async with session.post(BINANCE_P2P_SEARCH, data=_P2P_ENCODER.encode(payload), headers=_P2P_HEADERS) as resp:
+                raw = await resp.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        # Timed out or failed; the handler reports no offers instead of leaving its status message hanging.
+        return []
+
+    try:
+        result = _P2P_DECODER.decode(raw)
+    except msgspec.DecodeError:
+        # Not JSON, or not the shape we expect (e.g. an error page) — treat as no offers.
+        return []
 
     # Sort by price (float) ascending for buyers wanting the lowest price, or descending for sellers wanting highest —
     # We'll return as-is and let caller decide.
-    return items
+    return result.data or []
 
 # --- Market convert / coin info ---
 
-async def binance_ticker_price(symbol: str) -> Optional[float]:
-    """Fetch symbol price from Binance public API. symbol example: BTCUSDT"""
-    url = f"{BINANCE_REST_BASE}/api/v3/ticker/price?symbol={symbol.upper()}"
-    async with aiohttp.ClientSession() as session:
+_ALL_PRICES_CACHE: "OrderedDict[str, Tuple[Dict[str, float], float]]" = OrderedDict()
+_ALL_PRICES_INFLIGHT: Dict[str, asyncio.Task] = {}
+
+async def binance_ticker_prices(session: aiohttp.ClientSession, symbols: List[str]) -> Dict[str, float]:
+    """
+    Fetch prices for several symbols with a single request. Returns {symbol: price} for the ones that exist.
+    Binance's ?symbols=[...] form rejects the whole batch if any symbol is unknown (and convert_cmd
+    always probes pairs like USDTBTC), so this reads the full price list instead, cached for PRICE_CACHE_TTL.
+    Failures (timeouts, 429/418, unexpected bodies) return {} and are not cached.
+    """
+    async def fetch() -> Dict[str, float]:
+        async with _BINANCE_SEM:
+            j = await fetch_json(session, "GET", BINANCE_TICKER_ALL_URL, raise_for_status=True)
+        if not isinstance(j, list):
+            raise UpstreamError(f"unexpected Binance ticker response: {j!r:.200}")
         try:
-            j = await fetch_json(session, "GET", url)
-            if isinstance(j, dict) and "price" in j:
-                return float(j["price"])
-        except Exception:
+            return {t["symbol"]: float(t["price"]) for t in j if "symbol" in t and "price" in t}
+        except (TypeError, ValueError) as e:
+            raise UpstreamError(f"malformed Binance ticker entry: {e}") from e
+
+    try:
+        prices = await cached_fetch(_ALL_PRICES_CACHE, _ALL_PRICES_INFLIGHT, "ALL", PRICE_CACHE_TTL, fetch)
+    except (aiohttp.ClientError, asyncio.TimeoutError, UpstreamError):
+        # Rate-limited or failed: no prices now, but the next call asks Binance again.
+        return {}
+    return {s: prices[s] for s in (sym.upper() for sym in symbols) if s in prices}
+
+# CoinGecko tends to use ids like 'bitcoin', 'ethereum'. We'll try simple mapping heuristics for major coins.
+_COIN_ID_MAP = MappingProxyType({
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "USDT": "tether",
+    "TON": "toncoin",
+    "SOL": "solana",
+    "BNB": "binancecoin",
+    "ADA": "cardano",
+    "DOGE": "dogecoin",
+    "XRP": "ripple",
+})
+
+_COIN_INFO_CACHE: "OrderedDict[str, Tuple[Optional[Dict], float]]" = OrderedDict()
+_COIN_INFO_INFLIGHT: Dict[str, asyncio.Task] = {}
+_COIN_SEARCH_CACHE: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+_COIN_SEARCH_INFLIGHT: Dict[str, asyncio.Task] = {}
+# Ids found through /search, so repeat lookups of the same symbol skip the search call.
+_LEARNED_COIN_IDS: "OrderedDict[str, str]" = OrderedDict()
+
+async def coingecko_search_coin_id(session: aiohttp.ClientSession, symbol: str) -> Optional[str]:
+    """
+    Resolve a symbol to a CoinGecko id via the search endpoint (results cached for COIN_ID_CACHE_TTL).
+    Returns None when the search finds nothing; raises UpstreamError / aiohttp.ClientError when it fails.
+    """
+    sym = symbol.upper()
+    coin_id = _LEARNED_COIN_IDS.get(sym)
+    if coin_id is not None:
+        return coin_id
+
+    async def fetch() -> Optional[str]:
+        async with _COINGECKO_SEM:
+            res = await fetch_json(session, "GET", f"{COINGECKO_API}/search?query={sym}", raise_for_status=True)
+        coins = res.get("coins") if isinstance(res, dict) else None
+        if not isinstance(coins, list):
+            # e.g. {"status": {"error_code": 429, ...}} — not an answer, so don't cache it as a miss
+            raise UpstreamError(f"unexpected CoinGecko /search response: {res!r:.200}")
+        if not coins:
             return None
-    return None
-
-async def coingecko_coin_info_by_symbol(symbol: str) -> Optional[Dict]:
-    """Fetch basic coin info from CoinGecko API based on symbol."""
-    # CoinGecko tends to use ids like 'bitcoin', 'ethereum'. We'll try simple mapping heuristics for major coins.
-    mapping = {
-        "BTC": "bitcoin",
-        "ETH": "ethereum",
-        "USDT": "tether",
-        "TON": "toncoin",
-        "SOL": "solana",
-        "BNB": "binancecoin",
-        "ADA": "cardano",
-        "DOGE": "dogecoin",
-        "XRP": "ripple",
-    }
-    coin_id = mapping.get(symbol.upper(), None)
-    if coin_id is None:
-        # fallback: search endpoint
-        async with aiohttp.ClientSession() as session:
-            res = await fetch_json(session, "GET", f"{COINGECKO_API}/search?query={symbol}")
-            if isinstance(res, dict) and res.get("coins"):
-                coin_id = res["coins"][0]["id"]
-    if not coin_id:
-        return None
-    async with aiohttp.ClientSession() as session:
-        res = await fetch_json(session, "GET", f"{COINGECKO_API}/coins/{coin_id}")
-    # Return a curated subset
-    if isinstance(res, dict):
+        found = coins[0].get("id") if isinstance(coins[0], dict) else None
+        if not found:
+            raise UpstreamError(f"CoinGecko /search result without an id: {coins[0]!r:.200}")
+        lru_put(_LEARNED_COIN_IDS, sym, found)
+        return found
+
+    return await cached_fetch(_COIN_SEARCH_CACHE, _COIN_SEARCH_INFLIGHT, sym, COIN_ID_CACHE_TTL, fetch)
+
+async def coingecko_coin_info_by_symbol(session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+    """
+    Fetch basic coin info from CoinGecko API based on symbol.
+    The curated result is cached for COIN_INFO_CACHE_TTL seconds; upstream errors are not cached.
+    """
+    sym = symbol.upper()
+
+    async def fetch() -> Optional[Dict]:
+        coin_id = _COIN_ID_MAP.get(sym) or _LEARNED_COIN_IDS.get(sym)
+        if coin_id is None:
+            # fallback: search endpoint
+            coin_id = await coingecko_search_coin_id(session, sym)
+        if not coin_id:
+            return None
+        async with _COINGECKO_SEM:
+            res = await fetch_json(session, "GET", f"{COINGECKO_API}/coins/{coin_id}?{COINGECKO_COIN_QUERY}",
+                                   raise_for_status=True)
+        if not isinstance(res, dict) or not res.get("id"):
+            raise UpstreamError(f"unexpected CoinGecko /coins response: {res!r:.200}")
+        # Return a curated subset
         return {
             "id": res.get("id"),
             "symbol": res.get("symbol"),
@@ -129,12 +322,20 @@ async def coingecko_coin_info_by_symbol(symbol: str) -> Optional[Dict]:
             "current_price_usd": res.get("market_data", {}).get("current_price", {}).get("usd"),
             "price_change_24h": res.get("market_data", {}).get("price_change_percentage_24h"),
             "homepage": res.get("links", {}).get("homepage", [None])[0],
-            "description": (res.get("description", {}).get("en") or "").split("\n")[0][:400],
+            "description": (res.get("description", {}).get("en") or "").partition("\n")[0][:400],
         }
-    return None
+
+    try:
+        return await cached_fetch(_COIN_INFO_CACHE, _COIN_INFO_INFLIGHT, sym, COIN_INFO_CACHE_TTL, fetch)
+    except (aiohttp.ClientError, asyncio.TimeoutError, UpstreamError):
+        # Rate-limited or failed: nothing to show now, but the next call tries CoinGecko again.
+        return None
 
 # --- Telegram command handlers ---
 
+# Sort key for offers from fetch_p2p_offers (C-level attrgetter rather than a Python lambda).
+_PRICE_KEY = operator.attrgetter("price_f")
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Greets the user and explains the bot's purpose."""
     await update.message.reply_text(
@@ -159,19 +360,21 @@ async def p2p_usdt_top_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if trade not in ("BUY", "SELL"):
         await update.message.reply_text("trade must be 'buy' or 'sell'.")
         return
-    await update.message.reply_text(f"Fetching top USDT P2P offers ({trade}) for ETB...")
-    offers = await fetch_p2p_offers(asset="USDT", fiat="ETB", trade_type=trade, rows=20)
+    # The progress message is edited into the result, so each command sends only one message.
+    status_msg = await update.message.reply_text(f"Fetching top USDT P2P offers ({trade}) for ETB...")
+    session = context.application.bot_data["http_session"]
+    offers = await fetch_p2p_offers(session, asset="USDT", fiat="ETB", trade_type=trade, rows=20)
     if not offers:
-        await update.message.reply_text("No offers found.")
+        await status_msg.edit_text("No offers found.")
         return
-    # sort by price asc
-    offers_sorted = sorted(offers, key=lambda o: float(o.get("price") or 0.0))
+    # 10 cheapest offers, price asc
+    offers_sorted = heapq.nsmallest(10, offers, key=_PRICE_KEY)
     lines = []
-    for i, o in enumerate(offers_sorted[:10], start=1):
+    for i, o in enumerate(offers_sorted, start=1):
         lines.append(
-            f"{i}. {o.get('nickName') or 'anon'} — {o.get('price')} {o.get('fiat')} | min {o.get('minSingleTransAmount')} - max {o.get('maxSingleTransAmount')} | completed: {o.get('monthOrderCount') or 0}"
+            f"{i}. {o.advertiser.display_name or 'anon'} — {o.adv.price} {o.adv.fiat} | min {o.adv.minSingleTransAmount} - max {o.adv.maxSingleTransAmount} | completed: {o.advertiser.monthOrderCount or 0}"
         )
-    await update.message.reply_text("\n".join(lines))
+    await status_msg.edit_text("\n".join(lines))
 
 async def p2p_usdt_amount_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Usage: /p2p_usdt_amount 5000ETB [buy|sell]  OR /p2p_usdt_amount 50USDT"""
@@ -190,7 +393,7 @@ async def p2p_usdt_amount_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE
         elif amt_token.upper().endswith("USDT"):
             unit = "USDT"
             amount = float(amt_token[:-4])
-            trans_amount = str(amount)
+            trans_amount = None  # offer limits are in ETB; filtered client-side below
         else:
             await update.message.reply_text("Unit not recognized. End amount with ETB or USDT.")
             return
@@ -198,24 +401,29 @@ async def p2p_usdt_amount_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE
         await update.message.reply_text("Couldn't parse the amount. Use digits then unit, e.g. 5000ETB")
         return
 
-    await update.message.reply_text(f"Searching top offers for {amount}{unit} ({trade})...")
-    if unit == "ETB":
-        offers = await fetch_p2p_offers(asset="USDT", fiat="ETB", trade_type=trade, amount=trans_amount, rows=50)
-    else:
-        offers = await fetch_p2p_offers(asset="USDT", fiat="ETB", trade_type=trade, amount=trans_amount, rows=50)
+    status_msg = await update.message.reply_text(f"Searching top offers for {amount}{unit} ({trade})...")
+    session = context.application.bot_data["http_session"]
+    # transAmount is matched against the offer limits, which are in fiat (ETB). A USDT amount can't be
+    # passed through as-is, so for USDT we fetch unfiltered and keep offers whose limits fit amount * price.
+    offers = await fetch_p2p_offers(session, asset="USDT", fiat="ETB", trade_type=trade, amount=trans_amount, rows=50)
+    if unit == "USDT":
+        offers = [
+            o for o in offers
+            if float(o.adv.minSingleTransAmount or 0.0) <= amount * o.price_f <= float(o.adv.maxSingleTransAmount or math.inf)
+        ]
 
     if not offers:
-        await update.message.reply_text("No offers found for that amount.")
+        await status_msg.edit_text("No offers found for that amount.")
         return
 
-    # sort by price and display top 10
-    offers_sorted = sorted(offers, key=lambda o: float(o.get("price") or 0.0))
+    # display the 10 cheapest offers, price asc
+    offers_sorted = heapq.nsmallest(10, offers, key=_PRICE_KEY)
     lines = []
-    for i, o in enumerate(offers_sorted[:10], start=1):
+    for i, o in enumerate(offers_sorted, start=1):
         lines.append(
-            f"{i}. {o.get('nickName') or 'anon'} — {o.get('price')} {o.get('fiat')} | min {o.get('minSingleTransAmount')} - max {o.get('maxSingleTransAmount')}"
+            f"{i}. {o.advertiser.display_name or 'anon'} — {o.adv.price} {o.adv.fiat} | min {o.adv.minSingleTransAmount} - max {o.adv.maxSingleTransAmount}"
         )
-    await update.message.reply_text("\n".join(lines))
+    await status_msg.edit_text("\n".join(lines))
 
 async def convert_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Usage: /convert BTC USDT 0.01"""
@@ -227,38 +435,34 @@ async def convert_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     to = args[1].upper()
     amount = float(args[2]) if len(args) >= 3 else 1.0
 
-    # Try direct Binance symbol pair, else convert via USDT as intermediary
+    # Try direct Binance symbol pair, else convert via USDT as intermediary.
+    # All candidate pairs are priced by one batch lookup, so the fallback costs no extra round-trips.
     direct_symbol = f"{frm}{to}"
-    price = await binance_ticker_price(direct_symbol)
+    candidates = [direct_symbol]
+    if frm != "USDT":
+        candidates += [f"{frm}USDT", f"USDT{frm}"]
+    if to != "USDT":
+        candidates += [f"{to}USDT", f"USDT{to}"]
+    prices = await binance_ticker_prices(context.application.bot_data["http_session"], candidates)
+
+    price = prices.get(direct_symbol)
     if price is not None:
         result = amount * price
         await update.message.reply_text(f"{amount} {frm} = {result:.8f} {to} (via {direct_symbol} on Binance)")
         return
-    # fallback: use frm->USDT and to->USDT
-    frm_to_usdt = None
-    to_to_usdt = None
-    if frm != "USDT":
-        p = await binance_ticker_price(f"{frm}USDT")
-        if p is not None:
-            frm_to_usdt = p
-        else:
-            # try USDT pair reversed
-            p = await binance_ticker_price(f"USDT{frm}")
-            if p:
-                frm_to_usdt = 1.0 / p
-    else:
-        frm_to_usdt = 1.0
 
-    if to != "USDT":
-        p = await binance_ticker_price(f"{to}USDT")
-        if p is not None:
-            to_to_usdt = p
-        else:
-            p = await binance_ticker_price(f"USDT{to}")
-            if p:
-                to_to_usdt = 1.0 / p
-    else:
-        to_to_usdt = 1.0
+    def usdt_rate(sym: str) -> Optional[float]:
+        # price of 1 sym in USDT; the reversed USDT pair is inverted
+        if sym == "USDT":
+            return 1.0
+        if f"{sym}USDT" in prices:
+            return prices[f"{sym}USDT"]
+        p = prices.get(f"USDT{sym}")
+        return 1.0 / p if p else None
+
+    # fallback: use frm->USDT and to->USDT
+    frm_to_usdt = usdt_rate(frm)
+    to_to_usdt = usdt_rate(to)
 
     if frm_to_usdt is None or to_to_usdt is None:
         await update.message.reply_text("Couldn't fetch direct prices from Binance for those symbols. Try /coininfo for more info.")
@@ -274,28 +478,36 @@ async def coininfo_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Usage: /coininfo SYMBOL (e.g. BTC, ETH, TON)")
         return
     sym = args[0].upper()
-    await update.message.reply_text(f"Fetching info for {sym}...")
-    info = await coingecko_coin_info_by_symbol(sym)
+    status_msg = await update.message.reply_text(f"Fetching info for {sym}...")
+    info = await coingecko_coin_info_by_symbol(context.application.bot_data["http_session"], sym)
     if not info:
-        await update.message.reply_text("Coin not found on CoinGecko. Try a different symbol.")
+        await status_msg.edit_text("Coin not found on CoinGecko. Try a different symbol.")
         return
     text = (
-        f"{info.get('name')} ({info.get('symbol').upper()})\n"
+        f"{info.get('name')} ({(info.get('symbol') or sym).upper()})\n"
         f"Price (USD): {info.get('current_price_usd')}\n"
         f"Market Cap (USD): {info.get('market_cap')}\n"
         f"24h Change: {info.get('price_change_24h')}%\n"
         f"Website: {info.get('homepage')}\n"
         f"{info.get('description')[:300]}"
     )
-    await update.message.reply_text(text)
+    await status_msg.edit_text(text)
 
 
 # --- Main entry point ---
-async def main():
+def main():
     if not TELEGRAM_TOKEN:
         print("Set TELEGRAM_TOKEN environment variable and restart.")
         return
-    app = ApplicationBuilder().token(TELEGRAM_TOKEN).concurrent_updates(True).build()
+    # The shared HTTP session is opened once the application's loop is running and closed on shutdown.
+    app = (
+        ApplicationBuilder()
+        .token(TELEGRAM_TOKEN)
+        .concurrent_updates(True)
+        .post_init(open_session)
+        .post_shutdown(close_session)
+        .build()
+    )
 
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("help", help_cmd))
@@ -306,11 +518,12 @@ async def main():
 
     print("Bot started...")
     # The run_polling() method is a blocking call that starts the bot.
-    # It manages its own event loop, so calling asyncio.run() here causes a conflict.
-    await app.run_polling()
+    # It manages its own event loop, so it must not be wrapped in asyncio.run().
+    app.run_polling()
 
 if __name__ == '__main__':
-    # This is the corrected way to start the bot.
-    # We simply call the main() async function without wrapping it in asyncio.run().
-    # The Python-Telegram-Bot library handles the event loop for us.
-    asyncio.run(main())
+    if uvloop is not None:
+        # libuv-based event loop: cheaper callback scheduling and socket I/O than the default selector loop.
+        # run_polling() creates its loop through the policy, so this has to be set before main().
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    main()